@@ -0,0 +1,29 @@
+from pathlib import Path
+
+
+class Attachment:
+    """
+    Attachment metadata only; the bytes live in a separate blob file.
+    - path : local file to stream from when sending (empty once stored)
+    - blob : id of the stored blob in the mailbox blob directory
+    """
+
+    def __init__(self, name: str, size: int = 0, blob: str = "", path: str = ""):
+        self.name = name
+        self.size = size
+        self.blob = blob
+        self.path = path
+
+    @classmethod
+    def from_path(cls, path: str) -> "Attachment":
+        """Build an attachment to send from a local file (stat only, no read)."""
+        p = Path(path).expanduser()
+        if not p.is_file():
+            raise FileNotFoundError(f"Attachment '{path}' not found.")
+        return cls(p.name, p.stat().st_size, path=str(p))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "size": self.size, "blob": self.blob}
+
+    def __repr__(self):
+        return f"Attachment(name='{self.name}', size={self.size})"
@@ -1,11 +1,56 @@
 import json
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
 
+# blobs (attachments, large bodies) are copied in chunks of this size
+CHUNK_SIZE = 64 * 1024
+# bodies longer than this (in characters) are stored as a blob, not inline
+BODY_INLINE_LIMIT = 64 * 1024
+
+# stores held in memory by Mailbox.open_store(): resolved path -> store dict
+_open_stores: dict = {}
+# per open store: email -> number of messages added/removed since it was opened
+_open_revisions: dict = {}
+
+
 # minimal custom exception
 class ReceiverNotFoundError(Exception):
     pass
 
+
+def _read_store(path: Path) -> dict:
+    """Return the store at `path`, from memory if it is currently open."""
+    store = _open_stores.get(path.resolve())
+    if store is not None:
+        return store
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _bump_revision(path: Path, email: str) -> None:
+    """Record that messages were added to or removed from `email`'s entry."""
+    revisions = _open_revisions.get(path.resolve())
+    if revisions is not None:
+        revisions[email] = revisions.get(email, 0) + 1
+
+
+def _write_store(path: Path, store: dict) -> None:
+    """Persist `store`; open stores are only written back when they are closed."""
+    key = path.resolve()
+    if key in _open_stores:
+        _open_stores[key] = store
+        return
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(store, f, indent=2)
+
+
 class Mailbox:
     """
     Small Mailbox helper:
@@ -13,16 +58,60 @@ class Mailbox:
     - login(email, password, storage_path) -> Mailbox instance (raises ValueError on failure)
     - send_message(receiver_user, message) : store message in receiver's JSON entry
     - reload() : populate self.messages (list of Message instances)
+    - refresh() : reload() only if messages were added/removed (open stores)
+    - get_message(msg_id) : one Message, without loading the others
+    - save_attachment(attachment, dest) : stream a stored attachment to disk
+    - open_store(storage_path) : keep the JSON store in memory for many operations
+    - mark_read / set_flagged / delete_message(msg_id) : per-message state
+    - unread_count(box) / unread_messages(box) : served from the unread index
+
+    Each user entry keeps an "unread" index ({box: [message ids]}) next to its
+    messages; it is updated on send/read/delete so unread counts never need a
+    scan of the mailbox. A "next_id" counter only ever goes up, so message ids
+    are never reused after a delete.
+
+    Attachments and large bodies are kept as blob files in a directory next
+    to the JSON store ("<store>_blobs"); the JSON only holds their metadata.
     """
 
     def __init__(self, user, storage_path: str = "mail_store.json"):
         self.user = user
         self.storage_path = Path(storage_path)
-        if not self.storage_path.exists():
+        self.blob_dir = self.storage_path.parent / f"{self.storage_path.stem}_blobs"
+        if not self.storage_path.exists() and self.storage_path.resolve() not in _open_stores:
             self._save_store({})
         self.messages = []
+        self.unread_counts = {}
+        self._by_id = {}
+        self._seen = None  # (revisions dict, revision) at the last reload()
         self.reload()
 
+    @classmethod
+    @contextmanager
+    def open_store(cls, storage_path: str = "mail_store.json"):
+        """
+        Parse the JSON store once and serve every Mailbox operation on it from
+        memory until the block exits, then write it back once:
+
+            with Mailbox.open_store(path):
+                ...  # login / send_message / reload without re-reading the file
+        """
+        path = Path(storage_path)
+        key = path.resolve()
+        if key in _open_stores:
+            # already open further up the stack: the outer block writes it back
+            yield
+            return
+        store = _read_store(path)
+        _open_stores[key] = store
+        _open_revisions[key] = {}
+        try:
+            yield
+        finally:
+            store = _open_stores.pop(key)
+            _open_revisions.pop(key)
+            _write_store(path, store)
+
     @classmethod
     def create_mailbox(cls, user, storage_path: str = "mail_store.json") -> None:
         """
@@ -30,25 +119,17 @@ class Mailbox:
         Adds 'mdp' if missing (does not overwrite existing non-empty 'mdp').
         """
         path = Path(storage_path)
-        if not path.exists():
-            path.write_text(json.dumps({}), encoding="utf-8")
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                store = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            store = {}
+        store = _read_store(path)
 
         entry = store.get(user.email)
         if entry is None:
-            store[user.email] = {"mdp": user.password}
-            with path.open("w", encoding="utf-8") as f:
-                json.dump(store, f, indent=2)
+            store[user.email] = {"mdp": user.password, "next_id": 1, "unread": {}}
+            _write_store(path, store)
         else:
             if "mdp" not in entry or not entry.get("mdp"):
                 entry["mdp"] = user.password
                 store[user.email] = entry
-                with path.open("w", encoding="utf-8") as f:
-                    json.dump(store, f, indent=2)
+                _write_store(path, store)
 
     @classmethod
     def login(cls, email: str, password: str, storage_path: str = "mail_store.json"):
@@ -57,12 +138,7 @@ class Mailbox:
         Returns a Mailbox instance bound to a simple user-like object on success.
         Raises ValueError on failure.
         """
-        path = Path(storage_path)
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                store = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            store = {}
+        store = _read_store(Path(storage_path))
 
         entry = store.get(email)
         if entry is None:
@@ -82,6 +158,7 @@ class Mailbox:
         Send a Message instance to `receiver` (an object with .email).
         Raises ReceiverNotFoundError if the receiver is not present in the store.
         Message.date must be a datetime instance (serialized as ISO).
+        Attachments are streamed from their .path into new blobs.
         """
         store = self._load_store()
 
@@ -94,13 +171,41 @@ class Mailbox:
             "sender": message.sender_email,
             "date": date_iso,
             "header": message.header,
-            "body": message.body,
+            "read": False,
+            "flagged": False,
         }
+        body = message.body
+        written = []  # blobs created for this message, removed again on failure
+        try:
+            if len(body) > BODY_INLINE_LIMIT:
+                msg_dict["body"] = ""
+                msg_dict["body_blob"] = self._write_body_blob(body)
+                written.append(msg_dict["body_blob"])
+            else:
+                msg_dict["body"] = body
+            if message.attachments:
+                stored = []
+                for att in message.attachments:
+                    # always a fresh copy: a blob belongs to exactly one message
+                    blob_id, size = self._write_file_blob(att.path)
+                    written.append(blob_id)
+                    stored.append({"name": att.name, "size": size, "blob": blob_id})
+                msg_dict["attachments"] = stored
+        except Exception:
+            for blob_id in written:
+                self._blob_path(blob_id).unlink(missing_ok=True)
+            raise
+        for att, d in zip(message.attachments, msg_dict.get("attachments", [])):
+            att.blob, att.size, att.path = d["blob"], d["size"], ""
 
         receiver_entry = store[receiver.email]
-        numeric_keys = [int(k) for k in receiver_entry.keys() if k.isdigit()]
-        next_id = (max(numeric_keys) + 1) if numeric_keys else 1
-        receiver_entry[str(next_id)] = msg_dict
+        # index the existing messages first, so the new one is only added once
+        self._index_entry(receiver_entry)
+        msg_id = str(receiver_entry["next_id"])
+        receiver_entry["next_id"] += 1
+        receiver_entry[msg_id] = msg_dict
+        receiver_entry["unread"].setdefault(message.box, []).append(msg_id)
+        _bump_revision(self.storage_path, receiver.email)
 
         self._save_store(store)
 
@@ -108,42 +213,228 @@ class Mailbox:
         """
         Load this user's messages from the shared JSON store into self.messages.
         Reconstructs Message objects from stored dicts (requires message.py to exist).
+        Only metadata is loaded: blob bodies are read lazily, attachments never.
+        Also refreshes self.unread_counts ({box: count}) from the unread index.
         """
-        store = self._load_store()
-        entry = store.get(self.user.email, {})
+        store, entry = self._load_entry()
+        revisions = _open_revisions.get(self.storage_path.resolve())
+        if revisions is not None:
+            self._seen = (revisions, revisions.get(self.user.email, 0))
+        self.unread_counts = {box: len(ids) for box, ids in entry["unread"].items()}
         items = [(k, entry[k]) for k in entry.keys() if k.isdigit()]
         try:
             items.sort(key=lambda kv: int(kv[0]))
         except Exception:
             items.sort(key=lambda kv: kv[0])
 
-        messages = []
-        for _id, m in items:
-            try:
-                date_dt = datetime.fromisoformat(m.get("date"))
-            except Exception:
-                date_dt = datetime.now(timezone.utc)
-            # Import lazily to avoid circular imports in small projects
-            from message import Message
-            msg_obj = Message(
-                m.get("box", ""),
-                m.get("sender", ""),
-                date_dt,
-                m.get("header", ""),
-                m.get("body", "")
-            )
-            messages.append(msg_obj)
-        self.messages = messages
+        self.messages = [self._message_from_dict(_id, m) for _id, m in items]
+        self._by_id = {m.msg_id: m for m in self.messages}
 
-    def _load_store(self) -> dict:
+    def refresh(self) -> None:
+        """
+        reload(), unless the store is held open by open_store() and no message
+        was added to or removed from this mailbox since the last reload: flag
+        changes made through this Mailbox already update self.messages.
+        """
+        revisions = _open_revisions.get(self.storage_path.resolve())
+        if (revisions is not None and self._seen is not None and self._seen[0] is revisions
+                and self._seen[1] == revisions.get(self.user.email, 0)):
+            return
+        self.reload()
+
+    def get_message(self, msg_id: str):
+        """Build the Message `msg_id` alone from the store; raises KeyError if unknown."""
+        _, entry = self._load_entry()
+        return self._message_from_dict(msg_id, self._stored_message(entry, msg_id))
+
+    def mark_read(self, msg_id: str, read: bool = True) -> None:
+        """Set the read flag of message `msg_id` and update the unread index."""
+        store, entry = self._load_entry()
+        m = self._stored_message(entry, msg_id)
+        if m.get("read", False) == read:
+            return
+        m["read"] = read
+        ids = entry["unread"].setdefault(m.get("box", ""), [])
+        if read:
+            ids.remove(msg_id)
+        else:
+            ids.append(msg_id)
+            ids.sort(key=int)
+        self.unread_counts = {box: len(ids) for box, ids in entry["unread"].items()}
+        if msg_id in self._by_id:
+            self._by_id[msg_id].read = read
+        self._save_store(store)
+
+    def set_flagged(self, msg_id: str, flagged: bool = True) -> None:
+        """Set the flagged mark of message `msg_id`."""
+        store, entry = self._load_entry()
+        m = self._stored_message(entry, msg_id)
+        m["flagged"] = flagged
+        if msg_id in self._by_id:
+            self._by_id[msg_id].flagged = flagged
+        self._save_store(store)
+
+    def delete_message(self, msg_id: str) -> None:
+        """Remove message `msg_id`, its blobs and its unread index entry."""
+        store, entry = self._load_entry()
+        self._stored_message(entry, msg_id)
+        m = entry.pop(msg_id)
+        if not m.get("read", False):
+            entry["unread"].get(m.get("box", ""), []).remove(msg_id)
+        blobs = [a.get("blob", "") for a in m.get("attachments", [])] + [m.get("body_blob", "")]
+        for blob_id in blobs:
+            if blob_id:
+                self._blob_path(blob_id).unlink(missing_ok=True)
+        self.unread_counts = {box: len(ids) for box, ids in entry["unread"].items()}
+        _bump_revision(self.storage_path, self.user.email)
+        self._save_store(store)
+
+    def unread_count(self, box: str = "inbox") -> int:
+        _, entry = self._load_entry()
+        return len(entry["unread"].get(box, []))
+
+    def unread_messages(self, box: str = "inbox") -> list:
+        """
+        Build Message objects for the unread messages of `box` only, from the
+        index. Also refreshes self.unread_counts, like reload().
+        """
+        _, entry = self._load_entry()
+        self.unread_counts = {b: len(ids) for b, ids in entry["unread"].items()}
+        return [self._message_from_dict(_id, entry[_id]) for _id in entry["unread"].get(box, [])]
+
+    def save_attachment(self, attachment, dest) -> Path:
+        """
+        Stream a stored attachment to `dest` (a file path, or a directory in
+        which case the attachment name is used). Returns the written path.
+        Raises FileExistsError rather than overwriting an existing file.
+        """
+        dest = Path(dest).expanduser()
+        if dest.is_dir():
+            # the stored name comes from the sender: keep its last component only
+            dest = dest / (Path(attachment.name).name or attachment.blob)
+        src = self._blob_path(attachment.blob)
+        if not src.exists():
+            raise FileNotFoundError(f"Attachment blob for '{attachment.name}' is missing.")
+        with src.open("rb") as fin, dest.open("xb") as fout:
+            while True:
+                chunk = fin.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                fout.write(chunk)
+        return dest
+
+    def _message_from_dict(self, msg_id: str, m: dict):
+        try:
+            date_dt = datetime.fromisoformat(m.get("date"))
+        except Exception:
+            date_dt = datetime.now(timezone.utc)
+        # Import lazily to avoid circular imports in small projects
+        from message import Message
+        from attachment import Attachment
+        body_blob = m.get("body_blob")
+        msg_obj = Message(
+            m.get("box", ""),
+            m.get("sender", ""),
+            date_dt,
+            m.get("header", ""),
+            m.get("body", ""),
+            attachments=[
+                Attachment(a.get("name", ""), a.get("size", 0), a.get("blob", ""))
+                for a in m.get("attachments", [])
+            ],
+            body_loader=(lambda b=body_blob: self._read_body_blob(b)) if body_blob else None,
+        )
+        msg_obj.msg_id = msg_id
+        msg_obj.read = m.get("read", False)
+        msg_obj.flagged = m.get("flagged", False)
+        return msg_obj
+
+    def _load_entry(self):
+        """
+        Return (store, entry) for this user. An entry that predates the unread
+        index is indexed and saved right away, so the scan happens only once.
+        """
+        store = self._load_store()
+        entry = store.get(self.user.email)
+        if entry is None:
+            return store, {"next_id": 1, "unread": {}}
+        if self._index_entry(entry):
+            self._save_store(store)
+        return store, entry
+
+    @staticmethod
+    def _stored_message(entry: dict, msg_id: str) -> dict:
+        """
+        Return the stored dict of message `msg_id`. Raises KeyError for unknown
+        ids and for the entry's other keys ("mdp", "unread", "next_id").
+        """
+        if not (isinstance(msg_id, str) and msg_id.isdigit()) or msg_id not in entry:
+            raise KeyError(f"Message '{msg_id}' not found.")
+        return entry[msg_id]
+
+    @staticmethod
+    def _index_entry(entry: dict) -> bool:
+        """
+        Add the "unread" index ({box: [ids]}) and the "next_id" counter to an
+        entry that lacks them, scanning its messages. Returns True if changed.
+        """
+        if "unread" in entry and "next_id" in entry:
+            return False
+        ids = sorted((k for k in entry.keys() if k.isdigit()), key=int)
+        if "unread" not in entry:
+            index = {}
+            for k in ids:
+                if not entry[k].get("read", False):
+                    index.setdefault(entry[k].get("box", ""), []).append(k)
+            entry["unread"] = index
+        if "next_id" not in entry:
+            entry["next_id"] = int(ids[-1]) + 1 if ids else 1
+        return True
+
+    def _blob_path(self, blob_id: str) -> Path:
+        return self.blob_dir / blob_id
+
+    def _new_blob(self):
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        blob_id = uuid.uuid4().hex
+        return blob_id, self._blob_path(blob_id)
+
+    def _write_file_blob(self, src_path: str):
+        """Copy a local file into a new blob chunk by chunk; returns (blob_id, size)."""
+        blob_id, dest = self._new_blob()
+        size = 0
         try:
-            with self.storage_path.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+            with open(src_path, "rb") as fin, dest.open("wb") as fout:
+                while True:
+                    chunk = fin.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    fout.write(chunk)
+                    size += len(chunk)
+        except Exception:
+            dest.unlink(missing_ok=True)
+            raise
+        return blob_id, size
+
+    def _write_body_blob(self, body: str) -> str:
+        blob_id, dest = self._new_blob()
+        try:
+            with dest.open("w", encoding="utf-8") as f:
+                for i in range(0, len(body), CHUNK_SIZE):
+                    f.write(body[i:i + CHUNK_SIZE])
+        except Exception:
+            dest.unlink(missing_ok=True)
+            raise
+        return blob_id
+
+    def _read_body_blob(self, blob_id: str) -> str:
+        try:
+            return self._blob_path(blob_id).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return ""
+
+    def _load_store(self) -> dict:
+        return _read_store(self.storage_path)
 
     def _save_store(self, store: dict) -> None:
-        if not self.storage_path.parent.exists():
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.storage_path.open("w", encoding="utf-8") as f:
-            json.dump(store, f, indent=2)
+        _write_store(self.storage_path, store)
@@ -1,11 +1,15 @@
 from pathlib import Path
 from datetime import datetime, timezone
+import argparse
 import getpass
 import json
+import os
+import sys
 
-from mailbox import Mailbox          # your module
+from mailbox import Mailbox, ReceiverNotFoundError  # your module
 from user import User                # your User class: User(email, password)
 from message import Message          # your Message class
+from attachment import Attachment
 
 STORE = "mail_store.json"
 
@@ -73,9 +77,11 @@ def list_messages(mailbox: Mailbox):
     if not mailbox.messages:
         print("No messages.")
         return
+    print(f"{mailbox.unread_counts.get('inbox', 0)} unread")
     for i, m in enumerate(mailbox.messages, 1):
         # m is your Message instance; assume attributes: header, sender_email, date
-        print(f"{i}) {m.header}  from: {m.sender_email}  date: {m.date}")
+        mark = ("*" if not m.read else " ") + ("!" if m.flagged else " ")
+        print(f"{i}){mark} {m.header}  from: {m.sender_email}  date: {m.date}")
 
 
 def read_message(mailbox: Mailbox):
@@ -91,7 +97,10 @@ def read_message(mailbox: Mailbox):
     if i < 0 or i >= len(mailbox.messages):
         print("Out of range.")
         return
-    mailbox.messages[i].display()
+    msg = mailbox.messages[i]
+    msg.display()
+    if not msg.read:
+        mailbox.mark_read(msg.msg_id)
 
 
 def send_message_flow(mailbox: Mailbox):
@@ -116,9 +125,20 @@ def send_message_flow(mailbox: Mailbox):
             break
         lines.append(line)
     body = "\n".join(lines)
+    attachments = []
+    paths = input("Attach files (comma-separated paths, empty for none): ").strip()
+    for path in (p.strip() for p in paths.split(",")):
+        if not path:
+            continue
+        try:
+            attachments.append(Attachment.from_path(path))
+        except OSError as e:
+            print(e)
+            return
     # create a minimal user-like object for receiver: only .email required by send_message
     receiver = User(to_email, store[to_email].get("mdp", ""))  # password not used by send_message
-    msg = Message("inbox", mailbox.user.email, datetime.now(timezone.utc), header, body)
+    msg = Message("inbox", mailbox.user.email, datetime.now(timezone.utc), header, body,
+                  attachments=attachments)
     try:
         mailbox.send_message(receiver, msg)
         print("Message sent.")
@@ -147,7 +167,224 @@ def account_loop(mailbox: Mailbox):
             print("Unknown choice.")
 
 
+# ---------------------------------------------------------------------------
+# Headless mode: `python mainSimple.py <command> ...` or `... batch ops.ndjson`
+# ---------------------------------------------------------------------------
+
+def message_to_dict(number, m: Message, with_body: bool = False) -> dict:
+    d = {
+        "number": number,
+        "msg_id": m.msg_id,
+        "read": m.read,
+        "flagged": m.flagged,
+        "from": m.sender_email,
+        "date": m.date.isoformat() if hasattr(m.date, "isoformat") else str(m.date),
+        "header": m.header,
+        "box": m.box,
+        "attachments": [{"name": a.name, "size": a.size} for a in m.attachments],
+    }
+    if number is None:
+        del d["number"]
+    if with_body:
+        d["body"] = m.body
+    return d
+
+
+def pick_message(mailbox: Mailbox, op: dict):
+    """
+    Return (number, message) selected by op["msg_id"] or by 1-based op["number"].
+    Selecting by id reads that message only, so its number is None.
+    """
+    if op.get("msg_id") is not None:
+        try:
+            return None, mailbox.get_message(str(op["msg_id"]))
+        except KeyError:
+            raise ValueError(f"Message '{op['msg_id']}' not found")
+    mailbox.refresh()
+    i = op.get("number") or 0
+    if i < 1 or i > len(mailbox.messages):
+        raise ValueError("Out of range")
+    return i, mailbox.messages[i - 1]
+
+
+def check_op(op: dict) -> None:
+    """Raise ValueError if a field of `op` has the wrong JSON type."""
+    for field in ("op", "email", "password", "to", "header", "body", "query"):
+        if field in op and not isinstance(op[field], str):
+            raise ValueError(f"'{field}' must be a string")
+    msg_id = op.get("msg_id")
+    if msg_id is not None and (isinstance(msg_id, bool) or not isinstance(msg_id, (str, int))):
+        raise ValueError("'msg_id' must be a string or an integer")
+    number = op.get("number")
+    if number is not None and (isinstance(number, bool) or not isinstance(number, int)):
+        raise ValueError("'number' must be an integer")
+    paths = op.get("attachments", [])
+    if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+        raise ValueError("'attachments' must be a list of paths")
+
+
+def get_mailbox(op: dict, store_path: str, mailboxes: dict) -> Mailbox:
+    """
+    Log in once per (email, password) and reuse the Mailbox for later operations.
+    Operations that need the full message list call mailbox.refresh() themselves.
+    """
+    key = (op.get("email", ""), op.get("password", ""))
+    mailbox = mailboxes.get(key)
+    if mailbox is None:
+        mailbox = Mailbox.login(key[0], key[1], storage_path=store_path)
+        mailboxes[key] = mailbox
+    return mailbox
+
+
+def run_operation(op: dict, store_path: str = STORE, mailboxes=None) -> dict:
+    """
+    Execute one operation dict, e.g. {"op": "list", "email": ..., "password": ...}.
+    Returns a JSON-serializable result; errors are reported as {"ok": false, ...}.
+    """
+    if mailboxes is None:
+        mailboxes = {}
+    if not isinstance(op, dict):
+        return {"ok": False, "error": "Operation must be a JSON object"}
+    name = op.get("op", "")
+    result = {"op": name if isinstance(name, str) else ""}
+    # "tag" is only echoed back so callers can match results to operations
+    if "tag" in op:
+        result["tag"] = op["tag"]
+    try:
+        check_op(op)
+        if name == "register":
+            if not op.get("email") or not op.get("password"):
+                raise ValueError("Email and password required")
+            Mailbox.create_mailbox(User(op["email"], op["password"]), storage_path=store_path)
+        elif name == "send":
+            mailbox = get_mailbox(op, store_path, mailboxes)
+            attachments = [Attachment.from_path(p) for p in op.get("attachments", [])]
+            msg = Message("inbox", mailbox.user.email, datetime.now(timezone.utc),
+                          op.get("header", ""), op.get("body", ""), attachments=attachments)
+            mailbox.send_message(User(op.get("to", ""), ""), msg)
+        elif name == "list":
+            mailbox = get_mailbox(op, store_path, mailboxes)
+            if op.get("unread"):
+                # served from the unread index, without loading the whole mailbox
+                result["messages"] = [message_to_dict(None, m) for m in mailbox.unread_messages("inbox")]
+            else:
+                mailbox.refresh()
+                result["messages"] = [message_to_dict(i, m) for i, m in enumerate(mailbox.messages, 1)]
+            result["unread"] = mailbox.unread_counts.get("inbox", 0)
+        elif name == "read":
+            mailbox = get_mailbox(op, store_path, mailboxes)
+            i, m = pick_message(mailbox, op)
+            if not m.read:
+                mailbox.mark_read(m.msg_id)
+                m.read = True
+            result["message"] = message_to_dict(i, m, with_body=True)
+        elif name in ("unread", "flag", "unflag", "delete"):
+            mailbox = get_mailbox(op, store_path, mailboxes)
+            _, m = pick_message(mailbox, op)
+            if name == "unread":
+                mailbox.mark_read(m.msg_id, False)
+            elif name == "delete":
+                mailbox.delete_message(m.msg_id)
+            else:
+                mailbox.set_flagged(m.msg_id, name == "flag")
+            result["unread"] = mailbox.unread_counts.get("inbox", 0)
+        elif name == "search":
+            mailbox = get_mailbox(op, store_path, mailboxes)
+            mailbox.refresh()
+            query = op.get("query", "").lower()
+            result["messages"] = [
+                message_to_dict(i, m)
+                for i, m in enumerate(mailbox.messages, 1)
+                if query in m.header.lower() or query in m.sender_email.lower() or query in m.body.lower()
+            ]
+        else:
+            raise ValueError(f"Unknown op '{name}'")
+    except (ValueError, ReceiverNotFoundError, OSError) as e:
+        result["ok"] = False
+        result["error"] = str(e)
+        return result
+    result["ok"] = True
+    return result
+
+
+def run_batch(lines, store_path: str = STORE, out=sys.stdout) -> int:
+    """
+    Run NDJSON operations (one JSON object per line) with the store opened once.
+    Writes one NDJSON result per operation; returns the number of failures.
+    """
+    failures = 0
+    mailboxes = {}
+    with Mailbox.open_store(store_path):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                op = json.loads(line)
+            except json.JSONDecodeError as e:
+                result = {"ok": False, "error": f"Invalid JSON: {e}"}
+            else:
+                result = run_operation(op, store_path, mailboxes)
+            if not result["ok"]:
+                failures += 1
+            out.write(json.dumps(result) + "\n")
+    out.flush()
+    return failures
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Simple Mailbox, headless mode (JSON output).")
+    parser.add_argument("--store", default=STORE, help="path of the JSON store")
+    sub = parser.add_subparsers(dest="op", required=True)
+
+    account = argparse.ArgumentParser(add_help=False)
+    account.add_argument("--email", required=True)
+    account.add_argument("--password", default=os.environ.get("MAILBOX_PASSWORD", ""),
+                         help="defaults to $MAILBOX_PASSWORD")
+
+    sub.add_parser("register", parents=[account], help="create an account")
+    send = sub.add_parser("send", parents=[account], help="send a message")
+    send.add_argument("--to", required=True)
+    send.add_argument("--header", default="")
+    send.add_argument("--body", default=None, help="message body (read from stdin if omitted)")
+    send.add_argument("--attach", action="append", default=[], dest="attachments", metavar="PATH")
+    lst = sub.add_parser("list", parents=[account], help="list messages")
+    lst.add_argument("--unread", action="store_true", help="only unread messages")
+    selected = argparse.ArgumentParser(add_help=False, parents=[account])
+    selected.add_argument("number", type=int, nargs="?", help="1-based position in the list")
+    selected.add_argument("--id", dest="msg_id", help="select by message id instead")
+    sub.add_parser("read", parents=[selected], help="read one message (marks it read)")
+    sub.add_parser("unread", parents=[selected], help="mark a message unread")
+    sub.add_parser("flag", parents=[selected], help="flag a message")
+    sub.add_parser("unflag", parents=[selected], help="remove the flag of a message")
+    sub.add_parser("delete", parents=[selected], help="delete a message")
+    search = sub.add_parser("search", parents=[account], help="search header, sender and body")
+    search.add_argument("query")
+    batch = sub.add_parser("batch", help="run NDJSON operations from a file or stdin")
+    batch.add_argument("file", nargs="?", default="-", help="NDJSON file, '-' for stdin")
+    return parser
+
+
+def cli_main(argv) -> int:
+    args = build_parser().parse_args(argv)
+    if args.op == "batch":
+        if args.file == "-":
+            return 1 if run_batch(sys.stdin, args.store) else 0
+        with open(args.file, "r", encoding="utf-8") as f:
+            return 1 if run_batch(f, args.store) else 0
+
+    op = {k: v for k, v in vars(args).items() if k != "store"}
+    if args.op == "send" and args.body is None:
+        op["body"] = sys.stdin.read()
+    result = run_operation(op, args.store)
+    print(json.dumps(result, indent=2))
+    return 0 if result["ok"] else 1
+
+
 def main():
+    if len(sys.argv) > 1:
+        raise SystemExit(cli_main(sys.argv[1:]))
+
     print("Simple Mailbox TUI (no dependencies)")
     # ensure store exists
     p = Path(STORE)
@@ -1,12 +1,36 @@
 from datetime import datetime
 
 class Message:
-    def __init__(self, box: str, sender_email: str, date: datetime, header: str, body: str):
+    """
+    A mail message. Large bodies may be kept out of memory: when `body_loader`
+    is given, the body is only read (from its blob) the first time it is used.
+    """
+
+    def __init__(self, box: str, sender_email: str, date: datetime, header: str, body: str,
+                 attachments=None, body_loader=None):
         self.box = box
         self.sender_email = sender_email
         self.date = date
         self.header = header
-        self.body = body
+        self._body = body
+        self._body_loader = body_loader
+        self.attachments = list(attachments) if attachments else []
+        # set by Mailbox when loaded from the store
+        self.msg_id = ""
+        self.read = False
+        self.flagged = False
+
+    @property
+    def body(self) -> str:
+        if self._body_loader is not None:
+            self._body = self._body_loader()
+            self._body_loader = None
+        return self._body
+
+    @body.setter
+    def body(self, value: str) -> None:
+        self._body = value
+        self._body_loader = None
 
     def __repr__(self):
         return f"Message(from='{self.sender_email}', header='{self.header}', box='{self.box}', date='{self.date}')"
@@ -19,4 +43,8 @@ class Message:
         print(f"Date:   {self.date}")
         print("Body:")
         print(self.body)
+        if self.attachments:
+            print("Attachments:")
+            for i, a in enumerate(self.attachments, 1):
+                print(f"  {i}) {a.name} ({a.size} bytes)")
         print("-" * 40)
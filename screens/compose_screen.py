@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Compose screen (single-line body for simplicity)."""
+"""Compose screen (multi-line body, file attachments)."""
 
 from __future__ import annotations
 from pathlib import Path
@@ -8,10 +8,11 @@ import json
 
 from textual.screen import Screen
 from textual.containers import Horizontal
-from textual.widgets import Header, Footer, Static, Input, Button
+from textual.widgets import Header, Footer, Static, Input, Button, TextArea
 
 from user import User
 from message import Message
+from attachment import Attachment
 
 STORE = "mail_store.json"
 
@@ -19,23 +20,50 @@ STORE = "mail_store.json"
 class ComposeScreen(Screen):
     """Compose a message and send it via the Mailbox backend."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.attachments: list[Attachment] = []
+
     def compose(self):
         yield Header(show_clock=False)
         yield Static("Compose", id="title")
         yield Input(placeholder="To (email)", id="to")
         yield Input(placeholder="Header", id="header")
-        yield Input(placeholder="Body (single line)", id="body")
+        yield TextArea(id="body")
+        yield Horizontal(
+            Input(placeholder="Attachment path", id="attach_path"),
+            Button("Attach", id="attach"),
+        )
+        yield Static("", id="attachments")
         yield Horizontal(Button("Send", id="send"), Button("Back", id="back"))
         yield Static("", id="status")
         yield Footer()
 
+    def update_attachments(self) -> None:
+        names = ", ".join(f"{a.name} ({a.size} bytes)" for a in self.attachments)
+        self.query_one("#attachments", Static).update(f"Attachments: {names}" if names else "")
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id
         status = self.query_one("#status", Static)
-        if bid == "send":
+        if bid == "attach":
+            path_input = self.query_one("#attach_path", Input)
+            path = path_input.value.strip()
+            if not path:
+                status.update("Attachment path required.")
+                return
+            try:
+                self.attachments.append(Attachment.from_path(path))
+            except OSError as e:
+                status.update(f"Cannot attach: {e}")
+                return
+            path_input.value = ""
+            self.update_attachments()
+            status.update("")
+        elif bid == "send":
             to_email = self.query_one("#to", Input).value.strip()
             header = self.query_one("#header", Input).value.strip()
-            body = self.query_one("#body", Input).value.strip()
+            body = self.query_one("#body", TextArea).text
             if not to_email:
                 status.update("Recipient required.")
                 return
@@ -53,10 +81,13 @@ class ComposeScreen(Screen):
                 status.update("Recipient not found. Ask them to register first.")
                 return
             receiver = User(to_email, store[to_email].get("mdp", ""))
-            msg = Message("inbox", self.app.mailbox.user.email, datetime.now(timezone.utc), header, body)
+            msg = Message("inbox", self.app.mailbox.user.email, datetime.now(timezone.utc), header, body,
+                          attachments=self.attachments)
             try:
                 self.app.mailbox.send_message(receiver, msg)
                 status.update("Message sent.")
+                self.attachments = []
+                self.update_attachments()
                 # Refresh mailbox screen only when the user sends a message.
                 try:
                     screen = self.app.get_screen("mailbox")
@@ -70,4 +101,7 @@ class ComposeScreen(Screen):
             except Exception as e:
                 status.update(f"Failed to send: {e}")
         elif bid == "back":
+            # the screen instance is reused: don't carry attachments over
+            self.attachments = []
+            self.update_attachments()
             self.app.pop_screen()
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Mailbox inbox screen: list, refresh, read, compose, logout."""
+"""Mailbox inbox screen: list, refresh, read, unread filter, flag, delete, compose, logout."""
 
 from __future__ import annotations
 from pathlib import Path
@@ -21,6 +21,11 @@ STORE = "mail_store.json"
 class MailboxScreen(Screen):
     """Inbox view with a DataTable of messages."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.unread_only = False
+        self.rows: list[Message] = []  # messages shown in the table, in order
+
     def compose(self):
         yield Header(show_clock=False)
         yield Static(banner_text("Inbox", width=60), id="inbox_banner", expand=False)
@@ -29,6 +34,9 @@ class MailboxScreen(Screen):
         yield Horizontal(
             Button("Refresh", id="refresh"),
             Button("Read", id="read"),
+            Button("Unread only", id="unread_only"),
+            Button("Flag", id="flag"),
+            Button("Delete", id="delete"),
             Button("Compose", id="compose"),
             Button("Logout", id="logout"),
             Button("Quit", id="quit"),
@@ -36,8 +44,9 @@ class MailboxScreen(Screen):
         yield Static("", id="status")
         yield Footer()
 
-    def on_mount(self) -> None:
-        # prepare table on mount
+    def on_screen_resume(self) -> None:
+        # sent on the initial push too, and on return from ReadScreen/Compose
+        # where messages may have been read or received
         self.load_messages()
 
     def load_messages(self) -> None:
@@ -52,7 +61,7 @@ class MailboxScreen(Screen):
 
         # Clear the table in a way compatible with multiple textual versions.
         try:
-            table.clear()
+            table.clear(columns=True)
         except TypeError:
             # fallback: remove and recreate the DataTable widget
             parent = table.parent
@@ -61,39 +70,80 @@ class MailboxScreen(Screen):
             parent.mount(table)
 
         # (re)define columns
-        table.add_columns("No", "From", "Date", "Header")
+        table.add_columns("No", "", "From", "Date", "Header", "Att")
 
         if mailbox is None:
             status.update("No mailbox loaded.")
             return
 
-        mailbox.reload()
-        for i, m in enumerate(mailbox.messages, start=1):
+        if self.unread_only:
+            self.rows = mailbox.unread_messages("inbox")
+        else:
+            mailbox.reload()
+            self.rows = mailbox.messages
+        for i, m in enumerate(self.rows, start=1):
             date_str = m.date.isoformat() if hasattr(m.date, "isoformat") else str(m.date)
-            table.add_row(str(i), m.sender_email, date_str, m.header)
-
-        self.query_one("#account", Label).update(f"Account: {mailbox.user.email}")
-        status.update(f"{len(mailbox.messages)} message(s)")
+            mark = ("*" if not m.read else "") + ("!" if m.flagged else "")
+            # attachment metadata only; the blobs themselves are never read here
+            table.add_row(str(i), mark, m.sender_email, date_str, m.header, str(len(m.attachments) or ""))
+
+        # counts come from the index loaded by reload()/unread_messages() above
+        unread = mailbox.unread_counts.get("inbox", 0)
+        self.query_one("#account", Label).update(f"Account: {mailbox.user.email}  ({unread} unread)")
+        if self.unread_only:
+            status.update(f"{len(self.rows)} unread message(s)")
+        else:
+            status.update(f"{len(self.rows)} message(s)")
+
+    def selected_message(self) -> Message | None:
+        """Return the message under the table cursor, reporting why if there is none."""
+        table = self.query_one(DataTable)
+        if table.row_count == 0:
+            self.query_one("#status", Static).update("No messages.")
+            return None
+        if table.cursor_row is None:
+            self.query_one("#status", Static).update("Select a row first (use arrows).")
+            return None
+        row = table.get_row_at(table.cursor_row)
+        return self.rows[int(row[0]) - 1]
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id
         if bid == "refresh":
             self.load_messages()
         elif bid == "read":
-            table = self.query_one(DataTable)
-            if table.row_count == 0:
-                self.query_one("#status", Static).update("No messages to read.")
+            msg = self.selected_message()
+            if msg is None:
                 return
-            if table.cursor_row is None:
-                self.query_one("#status", Static).update("Select a row first (use arrows).")
-                return
-            row = table.get_row_at(table.cursor_row)
-            idx = int(row[0]) - 1
-            mailbox: Mailbox = self.app.mailbox
-            msg = mailbox.messages[idx]
             # ReadScreen takes a Message instance — push an instance
             from .read_screen import ReadScreen
             self.app.push_screen(ReadScreen(msg))
+        elif bid == "unread_only":
+            self.unread_only = not self.unread_only
+            event.button.label = "All messages" if self.unread_only else "Unread only"
+            self.load_messages()
+        elif bid == "flag":
+            msg = self.selected_message()
+            if msg is None:
+                return
+            try:
+                self.app.mailbox.set_flagged(msg.msg_id, not msg.flagged)
+            except KeyError:
+                self.load_messages()
+                self.query_one("#status", Static).update("Message no longer exists.")
+                return
+            self.load_messages()
+        elif bid == "delete":
+            msg = self.selected_message()
+            if msg is None:
+                return
+            try:
+                self.app.mailbox.delete_message(msg.msg_id)
+            except KeyError:
+                self.load_messages()
+                self.query_one("#status", Static).update("Message no longer exists.")
+                return
+            self.load_messages()
         elif bid == "compose":
             self.app.push_screen("compose")
         elif bid == "logout":
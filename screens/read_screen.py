@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 """Read message screen."""
 
+from pathlib import Path
+
 from textual.screen import Screen
 from textual.containers import Horizontal
-from textual.widgets import Header, Footer, Static, Button
+from textual.widgets import Header, Footer, Static, Button, Input
 
 from message import Message
 
@@ -19,9 +21,21 @@ class ReadScreen(Screen):
         yield Header(show_clock=False)
         yield Static("Message", id="title")
         yield Static(self.format_message(), id="content")
+        if self.message.attachments:
+            yield Horizontal(
+                Input(placeholder="Save attachments to (directory)", id="save_dir"),
+                Button("Save", id="save"),
+            )
+            yield Static("", id="status")
         yield Horizontal(Button("Back", id="back"), Button("Quit", id="quit"))
         yield Footer()
 
+    def on_mount(self) -> None:
+        mailbox = getattr(self.app, "mailbox", None)
+        if mailbox is not None and self.message.msg_id and not self.message.read:
+            mailbox.mark_read(self.message.msg_id)
+            self.message.read = True
+
     def format_message(self) -> str:
         m = self.message
         date_str = m.date.isoformat() if hasattr(m.date, "isoformat") else str(m.date)
@@ -32,12 +46,33 @@ class ReadScreen(Screen):
             f"Header: {m.header}",
             "",
             m.body,
-            "-" * 40,
         ]
+        if m.attachments:
+            parts.append("")
+            parts.append("Attachments:")
+            parts.extend(f"  {a.name} ({a.size} bytes)" for a in m.attachments)
+        parts.append("-" * 40)
         return "\n".join(parts)
 
+    def save_attachments(self) -> None:
+        """Stream every attachment of the message into the chosen directory."""
+        status = self.query_one("#status", Static)
+        dest = Path(self.query_one("#save_dir", Input).value.strip() or ".").expanduser()
+        if not dest.is_dir():
+            status.update(f"Not a directory: {dest}")
+            return
+        try:
+            for a in self.message.attachments:
+                self.app.mailbox.save_attachment(a, dest)
+        except Exception as e:
+            status.update(f"Failed to save: {e}")
+            return
+        status.update(f"Saved {len(self.message.attachments)} attachment(s) to {dest}")
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
-        if event.button.id == "back":
+        if event.button.id == "save":
+            self.save_attachments()
+        elif event.button.id == "back":
             self.app.pop_screen()
         else:
             self.app.action_quit()
@@ -0,0 +1,137 @@
+import json
+import pathlib
+from datetime import datetime, timezone
+
+import pytest
+
+from attachment import Attachment
+from mailbox import BODY_INLINE_LIMIT, CHUNK_SIZE, Mailbox
+from message import Message
+from user import User
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "store.json"
+    for email in ("a@x", "b@x"):
+        Mailbox.create_mailbox(User(email, "pw"), storage_path=str(path))
+    return path
+
+
+def send(store, body="body", attachments=()):
+    sender = Mailbox.login("a@x", "pw", storage_path=str(store))
+    msg = Message("inbox", "a@x", datetime.now(timezone.utc), "h", body, attachments=list(attachments))
+    sender.send_message(User("b@x", ""), msg)
+
+
+def blob_files(store):
+    blob_dir = store.parent / f"{store.stem}_blobs"
+    return sorted(p.name for p in blob_dir.iterdir()) if blob_dir.exists() else []
+
+
+def make_file(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+    return path
+
+
+def test_large_body_is_stored_out_of_line_and_loaded_lazily(store):
+    body = "y" * (BODY_INLINE_LIMIT + 1)
+    send(store, body=body)
+    stored = json.loads(store.read_text(encoding="utf-8"))["b@x"]["1"]
+    assert stored["body"] == ""
+    assert stored["body_blob"] in blob_files(store)
+
+    msg = Mailbox.login("b@x", "pw", storage_path=str(store)).messages[0]
+    assert msg._body_loader is not None
+    assert msg.body == body
+    assert msg._body_loader is None
+
+
+def test_small_body_stays_inline(store):
+    send(store, body="short")
+    stored = json.loads(store.read_text(encoding="utf-8"))["b@x"]["1"]
+    assert stored["body"] == "short"
+    assert "body_blob" not in stored
+    assert blob_files(store) == []
+
+
+def test_reload_does_not_open_attachment_blobs(store, tmp_path, monkeypatch):
+    send(store, attachments=[Attachment.from_path(make_file(tmp_path, "f.bin", 1000))])
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+
+    opened = []
+    real_open = pathlib.Path.open
+
+    def recording_open(self, *args, **kwargs):
+        opened.append(self)
+        return real_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(pathlib.Path, "open", recording_open)
+    mailbox.reload()
+    assert opened == [store]
+    assert [(a.name, a.size) for a in mailbox.messages[0].attachments] == [("f.bin", 1000)]
+
+
+def test_save_attachment_streams_a_copy(store, tmp_path):
+    src = make_file(tmp_path, "big.bin", 3 * CHUNK_SIZE + 17)
+    send(store, attachments=[Attachment.from_path(src)])
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    out = tmp_path / "out"
+    out.mkdir()
+
+    saved = mailbox.save_attachment(mailbox.messages[0].attachments[0], out)
+    assert saved == out / "big.bin"
+    assert saved.read_bytes() == src.read_bytes()
+
+
+def test_save_attachment_strips_path_components(store, tmp_path):
+    src = make_file(tmp_path, "f.bin", 10)
+    send(store, attachments=[Attachment("../../evil.bin", 10, path=str(src))])
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    out = tmp_path / "out"
+    out.mkdir()
+
+    assert mailbox.save_attachment(mailbox.messages[0].attachments[0], out) == out / "evil.bin"
+
+
+def test_save_attachment_does_not_overwrite(store, tmp_path):
+    send(store, attachments=[Attachment.from_path(make_file(tmp_path, "f.bin", 10))])
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "f.bin").write_bytes(b"keep")
+
+    with pytest.raises(FileExistsError):
+        mailbox.save_attachment(mailbox.messages[0].attachments[0], out)
+    assert (out / "f.bin").read_bytes() == b"keep"
+
+
+def test_failed_send_removes_blobs_already_written(store, tmp_path):
+    good = Attachment.from_path(make_file(tmp_path, "f.bin", 10))
+    missing = Attachment("gone.bin", 0, path=str(tmp_path / "gone.bin"))
+
+    with pytest.raises(FileNotFoundError):
+        send(store, body="y" * (BODY_INLINE_LIMIT + 1), attachments=[good, missing])
+    assert blob_files(store) == []
+    assert "1" not in json.loads(store.read_text(encoding="utf-8"))["b@x"]
+
+
+def test_each_message_gets_its_own_blob(store, tmp_path):
+    send(store, attachments=[Attachment.from_path(make_file(tmp_path, "f.bin", 10))])
+    send(store, attachments=[Attachment.from_path(make_file(tmp_path, "f.bin", 10))])
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    first, second = (m.attachments[0].blob for m in mailbox.messages)
+    assert first != second
+
+
+def test_delete_message_removes_its_blobs(store, tmp_path):
+    send(store, body="y" * (BODY_INLINE_LIMIT + 1),
+         attachments=[Attachment.from_path(make_file(tmp_path, "f.bin", 10))])
+    send(store, attachments=[Attachment.from_path(make_file(tmp_path, "g.bin", 10))])
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    kept = mailbox.messages[1].attachments[0].blob
+    assert len(blob_files(store)) == 3
+
+    mailbox.delete_message("1")
+    assert blob_files(store) == [kept]
@@ -0,0 +1,130 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from mailbox import Mailbox
+from message import Message
+from user import User
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "store.json"
+    for email in ("a@x", "b@x"):
+        Mailbox.create_mailbox(User(email, "pw"), storage_path=str(path))
+    return path
+
+
+def send(store, to, header="h"):
+    sender = Mailbox.login("a@x", "pw", storage_path=str(store))
+    msg = Message("inbox", "a@x", datetime.now(timezone.utc), header, "body")
+    sender.send_message(User(to, ""), msg)
+
+
+def entry(store, email="b@x"):
+    return json.loads(store.read_text(encoding="utf-8"))[email]
+
+
+def test_first_sends_index_each_message_once(store):
+    send(store, "b@x")
+    send(store, "b@x")
+    assert entry(store)["unread"] == {"inbox": ["1", "2"]}
+
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    assert mailbox.unread_counts == {"inbox": 2}
+    mailbox.mark_read("1")
+    assert mailbox.unread_count("inbox") == 1
+    assert [m.msg_id for m in mailbox.unread_messages("inbox")] == ["2"]
+
+
+def test_entry_without_index_is_indexed_once(store):
+    # entry written before the index existed
+    data = json.loads(store.read_text(encoding="utf-8"))
+    data["b@x"] = {
+        "mdp": "pw",
+        "1": {"box": "inbox", "sender": "a@x", "date": "2025-01-01T00:00:00", "header": "h", "body": ""},
+        "2": {"box": "inbox", "sender": "a@x", "date": "2025-01-01T00:00:00", "header": "h", "body": "",
+              "read": True},
+    }
+    store.write_text(json.dumps(data), encoding="utf-8")
+
+    send(store, "b@x")
+    assert entry(store)["unread"] == {"inbox": ["1", "3"]}
+    assert entry(store)["next_id"] == 4
+
+
+def test_index_built_on_read_is_saved(store):
+    data = json.loads(store.read_text(encoding="utf-8"))
+    data["b@x"] = {
+        "mdp": "pw",
+        "1": {"box": "inbox", "sender": "a@x", "date": "2025-01-01T00:00:00", "header": "h", "body": ""},
+    }
+    store.write_text(json.dumps(data), encoding="utf-8")
+
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    assert mailbox.unread_counts == {"inbox": 1}
+    assert entry(store)["unread"] == {"inbox": ["1"]}
+
+
+def test_delete_updates_counter_and_ids_are_not_reused(store):
+    send(store, "b@x")
+    send(store, "b@x")
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    mailbox.delete_message("2")
+    assert mailbox.unread_count("inbox") == 1
+
+    send(store, "b@x")
+    mailbox.reload()
+    assert [m.msg_id for m in mailbox.messages] == ["1", "3"]
+    assert mailbox.unread_counts == {"inbox": 2}
+
+
+def test_set_flagged(store):
+    send(store, "b@x")
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    mailbox.set_flagged("1")
+    assert entry(store)["1"]["flagged"] is True
+    mailbox.set_flagged("1", False)
+    mailbox.reload()
+    assert mailbox.messages[0].flagged is False
+    # flags are independent of the unread index
+    assert mailbox.unread_counts == {"inbox": 1}
+
+
+def test_mark_unread_again_keeps_index_sorted(store):
+    for _ in range(3):
+        send(store, "b@x")
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    mailbox.mark_read("1")
+    mailbox.mark_read("2")
+    assert entry(store)["unread"] == {"inbox": ["3"]}
+
+    mailbox.mark_read("1", False)
+    assert entry(store)["unread"] == {"inbox": ["1", "3"]}
+    assert entry(store)["1"]["read"] is False
+    # marking twice is a no-op
+    mailbox.mark_read("1", False)
+    assert mailbox.unread_count("inbox") == 2
+
+
+def test_unread_messages_after_delete(store):
+    for header in ("one", "two", "three"):
+        send(store, "b@x", header)
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    mailbox.mark_read("3")
+    mailbox.delete_message("3")  # read: index unchanged
+    mailbox.delete_message("1")  # unread: leaves the index
+    assert [(m.msg_id, m.header) for m in mailbox.unread_messages("inbox")] == [("2", "two")]
+    assert mailbox.unread_counts == {"inbox": 1}
+
+
+@pytest.mark.parametrize("msg_id", ["mdp", "unread", "next_id", "99", 1])
+def test_only_message_ids_are_accepted(store, msg_id):
+    send(store, "b@x")
+    mailbox = Mailbox.login("b@x", "pw", storage_path=str(store))
+    for call in (mailbox.mark_read, mailbox.set_flagged, mailbox.delete_message):
+        with pytest.raises(KeyError):
+            call(msg_id)
+    assert entry(store)["mdp"] == "pw"
+    assert entry(store)["unread"] == {"inbox": ["1"]}
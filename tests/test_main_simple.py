@@ -0,0 +1,117 @@
+import io
+import json
+
+import pytest
+
+import mainSimple
+from mailbox import Mailbox
+from user import User
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "store.json"
+    for email in ("a@x", "b@x"):
+        Mailbox.create_mailbox(User(email, "pw"), storage_path=str(path))
+    return path
+
+
+def op(name, email="b@x", **fields):
+    return dict(op=name, email=email, password="pw", **fields)
+
+
+def batch(store, ops):
+    lines = [o if isinstance(o, str) else json.dumps(o) for o in ops]
+    out = io.StringIO()
+    failures = mainSimple.run_batch(lines, str(store), out=out)
+    return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_batch_reads_and_writes_the_store_once(store, monkeypatch):
+    calls = {"load": 0, "dump": 0}
+    real_load, real_dump = json.load, json.dump
+
+    def load(*args, **kwargs):
+        calls["load"] += 1
+        return real_load(*args, **kwargs)
+
+    def dump(*args, **kwargs):
+        calls["dump"] += 1
+        return real_dump(*args, **kwargs)
+
+    monkeypatch.setattr(json, "load", load)
+    monkeypatch.setattr(json, "dump", dump)
+    ops = [op("send", "a@x", to="b@x", header=f"h{i}") for i in range(20)]
+    ops += [op("read", number=1), op("flag", msg_id="2"), op("delete", msg_id="3"), op("list")]
+    failures, results = batch(store, ops)
+
+    assert failures == 0
+    assert calls == {"load": 1, "dump": 1}
+    assert [m["msg_id"] for m in results[-1]["messages"]][:3] == ["1", "2", "4"]
+
+
+@pytest.mark.parametrize("line", [
+    "not json",
+    "[1]",
+    json.dumps(op("read", number=[1])),
+    json.dumps(op("read", number="1")),
+    json.dumps(op("search", query=5)),
+    json.dumps(op("send", "a@x", to="b@x", body=5)),
+    json.dumps(op("send", "a@x", to=["b@x"])),
+    json.dumps(op("send", "a@x", to="b@x", attachments="f.bin")),
+    json.dumps(op("send", "a@x", to="b@x", attachments=[1])),
+    json.dumps(op("send", "a@x", to="b@x", attachments=["missing.bin"])),
+    json.dumps(op("send", "a@x", to="nobody@x")),
+    json.dumps(op("read", number=1)),
+    json.dumps(op("delete", msg_id="mdp")),
+    json.dumps(op("frobnicate")),
+])
+def test_bad_line_reports_an_error_and_batch_continues(store, line):
+    failures, results = batch(store, [line, op("list")])
+    assert failures == 1
+    assert results[0]["ok"] is False
+    assert results[0]["error"]
+    assert results[1]["ok"] is True
+
+
+def test_tag_is_echoed_back(store):
+    _, results = batch(store, [op("list", tag="t-1"), op("nope", tag=7), op("list")])
+    assert results[0]["tag"] == "t-1"
+    assert results[1]["tag"] == 7
+    assert "tag" not in results[2]
+
+
+def test_read_marks_read_and_sees_new_messages(store):
+    _, results = batch(store, [
+        op("send", "a@x", to="b@x", body="first"),
+        op("read", number=1),
+        op("send", "a@x", to="b@x", body="second"),
+        op("read", number=2),
+        op("read", msg_id="1"),
+    ])
+    assert results[1]["message"]["body"] == "first"
+    assert results[3]["message"]["body"] == "second"
+    assert results[4]["message"]["read"] is True
+    assert "number" not in results[4]["message"]
+
+
+def test_cli_list_unread(store, capsys):
+    batch(store, [op("send", "a@x", to="b@x", header=h) for h in ("one", "two", "three")]
+          + [op("read", number=2)])
+
+    code = mainSimple.cli_main(["--store", str(store), "list", "--email", "b@x", "--password", "pw", "--unread"])
+    result = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert result["unread"] == 2
+    assert [(m["msg_id"], m["header"]) for m in result["messages"]] == [("1", "one"), ("3", "three")]
+
+
+def test_nested_open_store_writes_only_when_outermost_exits(store):
+    before = store.read_text(encoding="utf-8")
+    with Mailbox.open_store(str(store)):
+        with Mailbox.open_store(str(store)):
+            Mailbox.create_mailbox(User("c@x", "pw"), storage_path=str(store))
+        assert store.read_text(encoding="utf-8") == before
+        # still served from memory
+        assert Mailbox.login("c@x", "pw", storage_path=str(store)).user.email == "c@x"
+    assert "c@x" in json.loads(store.read_text(encoding="utf-8"))